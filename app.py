@@ -27,7 +27,7 @@ def healthz():
     return "ok", 200
 
 # -------------- cache for offered --------------
-_offered_cache: Dict[str, dict] = {}
+_offered_cache: Dict[str, engine.OfferedCourse] = {}
 _cache_lock = threading.Lock()
 
 def ensure_offered_cached(refresh: bool = False):
@@ -50,8 +50,8 @@ def _prettify_reason_text(reason: str) -> str:
 
     def _rep(m):
         code = m.group(0)
-        info = engine.plan.get(code) or {}
-        return info.get("name", code)
+        info = engine.plan.get(code)
+        return info.name if info is not None else code
 
     return pattern.sub(_rep, reason)
 
@@ -59,7 +59,8 @@ def _humanize_rejected(rejected_dict: dict) -> list[dict]:
     """يرجع قائمة مرتبة لعرضها في الواجهة، مع تحويل الأكواد داخل نص السبب إلى أسماء."""
     out = []
     for code, reason in rejected_dict.items():
-        name = engine.plan.get(code, {}).get("name", code)
+        info = engine.plan.get(code)
+        name = info.name if info is not None else code
         pretty_reason = _prettify_reason_text(reason)
         out.append({"code": code, "name": name, "reason": pretty_reason})
     return out
@@ -67,17 +68,7 @@ def _humanize_rejected(rejected_dict: dict) -> list[dict]:
 # -------------- API: plan --------------
 @app.get("/api/plan")
 def api_plan():
-    out = [
-        {
-            "code": code,
-            "name": info.get("name", code),
-            "hours": int(info.get("hours", 3)),
-            "category": info.get("category", ""),
-            "prerequisites": info.get("prerequisites", []),  # CODES
-            "min_hours": info.get("min_hours", None),
-        }
-        for code, info in engine.plan.items()
-    ]
+    out = [info.to_dict() for info in engine.plan.values()]
     return jsonify(out)
 
 # -------------- API: offered --------------
@@ -97,7 +88,7 @@ def api_offered():
         "rejected": list(rejected.items())[:40],
         "rejected_human": _humanize_rejected(rejected),  # واجهة تستخدم هذا
         "bulletin_url": COURSE_BULLETIN_URL,
-        "offered": eligible,
+        "offered": {code: course.to_dict() for code, course in eligible.items()},
     })
 
 # -------------- API: recommend --------------
@@ -121,7 +112,7 @@ def api_recommend():
 
     # build taken_courses from plan using the CODES
     engine.taken_courses = {
-        c: {"hours": engine.plan.get(c, {}).get("hours", 3)}
+        c: {"hours": engine.plan[c].hours}
         for c in taken_codes if c in engine.plan
     }
 
@@ -132,14 +123,14 @@ def api_recommend():
         picked = engine.simple_recommendation(taken_codes)
         result = []
         for code in picked:
-            info = engine.plan.get(code, {})
+            info = engine.plan[code]
             result.append({
                 "code": code,
-                "name": info.get("name", code),
-                "hours": int(info.get("hours", 3)),
+                "name": info.name,
+                "hours": int(info.hours),
                 "time": "",
                 "instructor": "",
-                "category": info.get("category", "")
+                "category": info.category
             })
         return jsonify({
             "ok": True,
@@ -165,7 +156,7 @@ def api_recommend():
         }), 200
 
     best = engine.genetic_algorithm(population_size=100, generations=150)
-    total_hours = sum(eligible[c]["hours"] for c in best) if best else 0
+    total_hours = sum(eligible[c].hours for c in best) if best else 0
     assignment = engine.assign_non_conflicting_sections(best, eligible) if best else None
 
     if not best or total_hours == 0 or total_hours > engine.max_hours:
@@ -179,12 +170,13 @@ def api_recommend():
 
     result = []
     for code in best:
-        chosen = (assignment or {}).get(code) or {}
-        times_str = chosen.get("time") or " | ".join(chosen.get("times", [])) if chosen else ""
-        instr = chosen.get("instructor", "")
-        hours = eligible[code]["hours"]
-        name  = engine.plan.get(code, {}).get("name", eligible[code]["name"])
-        category = engine.plan.get(code, {}).get("category", "")
+        chosen = (assignment or {}).get(code)
+        times_str = chosen.time if chosen is not None else ""
+        instr = chosen.instructor if chosen is not None else ""
+        hours = eligible[code].hours
+        info  = engine.plan.get(code)
+        name  = info.name if info is not None else eligible[code].name
+        category = info.category if info is not None else ""
         result.append({
             "code": code,
             "name": name,
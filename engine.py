@@ -1,6 +1,7 @@
 from __future__ import annotations
-import os, re, json, random, logging
-from typing import Dict, List, Optional
+import os, re, sys, json, random, logging
+from array import array
+from typing import Dict, Iterable, List, Optional
 
 # -------------------- paths / globals --------------------
 BASE_DIR = os.path.dirname(__file__)
@@ -8,8 +9,8 @@ PLAN_JSON_PATH = os.path.join(BASE_DIR, "full_plan_en_complete.json")
 
 # will be mutated by app.py
 max_hours: int = 18
-plan: Dict[str, dict] = {}               # {CODE: {name,hours,prerequisites,category,min_hours?}}
-offered: Dict[str, dict] = {}            # {CODE: {name,hours,sections:[{times|time,dept,instructor,state}]}}
+plan: Dict[str, "PlanCourse"] = {}        # {CODE: PlanCourse}
+offered: Dict[str, "OfferedCourse"] = {}  # {CODE: OfferedCourse}
 taken_courses: Dict[str, dict] = {}      # {CODE: {hours}}
 
 # -------------------- constants --------------------
@@ -54,21 +55,27 @@ def slot_to_intervals(slot_str: str):
     return [(DAY_MAP[d], start, end) for d in days]
 
 def _split_slots(v):
-    if isinstance(v, list):
+    if isinstance(v, (list, tuple)):
         slots = v
     else:
         slots = re.split(r"[|,\n،]+", str(v or ""))
     return [s.strip() for s in slots if s and s.strip()]
 
-def section_to_intervals(section: dict):
-    slots = section.get("times") or _split_slots(section.get("time"))
-    intervals = []
+def pack_intervals(slots) -> array:
+    # flat [day, start, end, day, start, end, ...] in minutes
+    packed = array("H")
     for s in slots:
-        intervals.extend(slot_to_intervals(s))
-    return intervals
-
-def intervals_overlap(a, b) -> bool:
-    return a[0] == b[0] and a[1] < b[2] and b[1] < a[2]
+        for iv in slot_to_intervals(s):
+            packed.extend(iv)
+    return packed
+
+def packed_overlap(a, b) -> bool:
+    for i in range(0, len(a), 3):
+        d, s, e = a[i], a[i + 1], a[i + 2]
+        for j in range(0, len(b), 3):
+            if b[j] == d and s < b[j + 2] and b[j + 1] < e:
+                return True
+    return False
 
 def norm_code(x):
     s = str(x or "").translate(AR_DIGITS)
@@ -87,20 +94,83 @@ def norm_ar(s: str) -> str:
     s = re.sub(r"\s+", " ", s).strip()
     return s
 
+# -------------------- records --------------------
+# compact in-memory model; converted to the JSON shape only in app.py (to_dict)
+_intern = sys.intern
+
+class PlanCourse:
+    __slots__ = ("code", "name", "hours", "prerequisites", "category", "min_hours")
+
+    def __init__(self, code: str, name: str, hours: int, prerequisites: Iterable[str],
+                 category: str = "", min_hours=None):
+        self.code = _intern(code)
+        self.name = _intern(name)
+        self.hours = hours
+        self.prerequisites = tuple(_intern(p) for p in prerequisites)
+        self.category = _intern(category)
+        self.min_hours = min_hours
+
+    def to_dict(self) -> dict:
+        return {
+            "code": self.code,
+            "name": self.name,
+            "hours": self.hours,
+            "category": self.category,
+            "prerequisites": list(self.prerequisites),  # CODES
+            "min_hours": self.min_hours,
+        }
+
+class Section:
+    __slots__ = ("dept", "instructor", "state", "times", "time", "intervals")
+
+    def __init__(self, dept: int, instructor: str, state: str, times):
+        self.dept = dept
+        self.instructor = _intern(instructor)
+        self.state = _intern(state)
+        self.times = tuple(_split_slots(times))
+        self.time = " | ".join(self.times)
+        self.intervals = pack_intervals(self.times)
+
+    def to_dict(self) -> dict:
+        return {
+            "dept": self.dept,
+            "instructor": self.instructor,
+            "state": self.state,
+            "times": list(self.times),
+            "time": self.time,
+        }
+
+class OfferedCourse:
+    __slots__ = ("code", "name", "hours", "sections")
+
+    def __init__(self, code: str, name: str, hours: int, sections: Iterable[Section] = ()):
+        self.code = _intern(code)
+        self.name = _intern(name)
+        self.hours = hours
+        self.sections = tuple(sections)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "hours": self.hours,
+            "sections": [sec.to_dict() for sec in self.sections],
+        }
+
 # -------------------- plan I/O --------------------
-def load_plan_from_json(path: str = PLAN_JSON_PATH) -> Dict[str, dict]:
+def load_plan_from_json(path: str = PLAN_JSON_PATH) -> Dict[str, PlanCourse]:
     with open(path, "r", encoding="utf-8") as f:
         raw = json.load(f)
     plan_by_code = {}
     for code, info in raw.items():
         c = norm_code(code)
-        plan_by_code[c] = {
-            "name": info.get("name", c),
-            "hours": int(info.get("hours", 3) or 3),
-            "prerequisites": [norm_code(x) for x in info.get("prerequisites", [])],
-            "category": info.get("category", ""),
-            "min_hours": info.get("min_hours", None),
-        }
+        plan_by_code[c] = PlanCourse(
+            c,
+            info.get("name", c),
+            int(info.get("hours", 3) or 3),
+            [norm_code(x) for x in info.get("prerequisites", [])],
+            info.get("category", ""),
+            info.get("min_hours", None),
+        )
     return plan_by_code
 
 # -------------------- scraper --------------------
@@ -120,7 +190,7 @@ def _chrome_opts():
     opts.add_argument("--window-size=1920,1080")
     return opts
 
-def scrape_offered_courses(departments=None, headless=True) -> Dict[str, dict]:
+def scrape_offered_courses(departments=None, headless=True) -> Dict[str, OfferedCourse]:
     if departments is None:
         departments = ["الهندسة الكهربائية", "العلوم الاساسية العلمية", "العلوم الاساسية الانسانية"]
     chrome_opts = _chrome_opts()
@@ -141,25 +211,15 @@ def scrape_offered_courses(departments=None, headless=True) -> Dict[str, dict]:
 
     search_btn = driver.find_element(By.XPATH, "//input[@type='button' and contains(@onclick,'doSearch')]")
 
-    out = {}
+    scraped = {}  # {CODE: (name, hours, [Section])}
     def add_section(code: str, course_name: str, hours: int, dept_num: int,
                     raw_time: str, instructor: str, state: str):
         times = [t.strip() for t in (raw_time or "").splitlines() if t.strip()]
-        section = {
-            "dept": dept_num,
-            "instructor": (instructor or "").strip(),
-            "state": (state or "").strip(),
-            "times": times,
-            "time": " | ".join(times),
-        }
-        if code not in out:
-            out[code] = {
-                "name": (course_name or "").strip(),
-                "hours": int((hours or 0)),
-                "sections": [section],
-            }
+        section = Section(dept_num, (instructor or "").strip(), (state or "").strip(), times)
+        if code not in scraped:
+            scraped[code] = ((course_name or "").strip(), int((hours or 0)), [section])
         else:
-            out[code]["sections"].append(section)
+            scraped[code][2].append(section)
 
     for opt in wanted:
         dept_select.select_by_visible_text(opt.text)
@@ -193,14 +253,15 @@ def scrape_offered_courses(departments=None, headless=True) -> Dict[str, dict]:
             WebDriverWait(driver, 10).until(EC.staleness_of(anchor))
 
     driver.quit()
-    return out
+    return {code: OfferedCourse(code, name, hours, tuple(secs))
+            for code, (name, hours, secs) in scraped.items()}
 
 # -------------------- eligibility / filtering --------------------
 def get_total_completed_hours(taken: dict) -> int:
     return sum(int(c.get("hours", 0)) for c in taken.values())
 
-def get_min_hours_required(code: str, info_from_plan: dict):
-    mh = info_from_plan.get("min_hours")
+def get_min_hours_required(code: str, info_from_plan: Optional[PlanCourse]):
+    mh = info_from_plan.min_hours if info_from_plan is not None else None
     if mh is None:
         mh = minimum_hours_required.get(code)
     if isinstance(mh, str):
@@ -217,7 +278,7 @@ def filter_offered_by_plan_and_taken(offered_all: dict, plan_: dict, taken: dict
     # تطبيع الأكواد المُنجزة لمطابقة سريعة
     taken_norm = set(norm_code(t) for t in taken.keys())
 
-    for code, data in offered_all.items():
+    for code, course in offered_all.items():
         c = norm_code(code)
 
         # 1) already taken
@@ -232,10 +293,9 @@ def filter_offered_by_plan_and_taken(offered_all: dict, plan_: dict, taken: dict
             continue
 
         # 3) prerequisites (CODES) + إظهار الأسماء في السبب
-        prereqs = [norm_code(p) for p in info.get("prerequisites", [])]
-        missing = [p for p in prereqs if p not in taken_norm]
+        missing = [p for p in info.prerequisites if p not in taken_norm]
         if missing:
-            missing_names = [ (plan_.get(p) or {}).get("name", p) for p in missing ]
+            missing_names = [ plan_[p].name if p in plan_ else p for p in missing ]
             rejected[c] = f"لا بد من إنهاء: {', '.join(missing_names)}"
             continue
 
@@ -245,26 +305,20 @@ def filter_offered_by_plan_and_taken(offered_all: dict, plan_: dict, taken: dict
             rejected[c] = f"min_hours:{mh}, have:{total_completed}"
             continue
 
-        # 5) sections with valid times and not canceled
-        valid_sections = []
-        for sec in data.get("sections", []):
-            state = str(sec.get("state", "")).strip()
-            times = _split_slots(sec.get("times") or sec.get("time"))
-            if not times:
-                continue
-            if "ملغ" in state:
-                continue
-            valid_sections.append({**sec, "times": times, "time": " | ".join(times)})
+        # 5) sections with valid times and not canceled (shared, not copied)
+        valid_sections = tuple(sec for sec in course.sections
+                               if sec.times and "ملغ" not in sec.state)
 
         if not valid_sections:
             rejected[c] = "no_valid_sections"
             continue
 
-        eligible_offered[c] = {
-            "name": data.get("name", (plan_.get(c) or {}).get("name", c)),
-            "hours": int(data.get("hours", (plan_.get(c) or {}).get("hours", 3))),
-            "sections": valid_sections,
-        }
+        if c == course.code and len(valid_sections) == len(course.sections):
+            eligible_offered[c] = course
+        else:
+            eligible_offered[c] = OfferedCourse(
+                c, course.name, course.hours, valid_sections
+            )
 
     return eligible_offered, rejected
 
@@ -272,10 +326,10 @@ def filter_offered_by_plan_and_taken(offered_all: dict, plan_: dict, taken: dict
 def taken_category_hours_map(taken_: dict, plan_: dict):
     acc = {cat: 0 for cat in category_limits}
     for code, c in taken_.items():
-        cat = plan_.get(code, {}).get("category")
-        if cat in acc:
-            hours = int(c.get("hours", plan_.get(code, {}).get("hours", 0)) or 0)
-            acc[cat] += hours
+        info = plan_.get(code)
+        if info is not None and info.category in acc:
+            hours = int(c.get("hours", info.hours) or 0)
+            acc[info.category] += hours
     return acc
 
 def compute_taken_cat_hours():
@@ -283,23 +337,15 @@ def compute_taken_cat_hours():
 
 # -------------------- GA --------------------
 def assign_non_conflicting_sections(individual, offered_map):
-    used_intervals = []
+    used_intervals = array("H")
     chosen = {}
     for code in individual:
         picked = None
-        for sec in offered_map[code].get("sections", []):
-            ints = section_to_intervals(sec)
+        for sec in offered_map[code].sections:
+            ints = sec.intervals
             if not ints:
                 continue
-            ok = True
-            for i in ints:
-                for u in used_intervals:
-                    if intervals_overlap(i, u):
-                        ok = False
-                        break
-                if not ok:
-                    break
-            if ok:
+            if not packed_overlap(ints, used_intervals):
                 picked = sec
                 used_intervals.extend(ints)
                 break
@@ -319,24 +365,23 @@ def fitness(individual, TAKEN_CAT_HOURS):
     total_completed_hours = sum(course.get("hours", 0) for course in taken_courses.values())
 
     for code in individual:
-        info = plan.get(code, {})
-        prereqs = info.get("prerequisites", [])
-        if any(p not in taken_courses for p in prereqs):
+        info = plan.get(code)
+        if info is not None and any(p not in taken_courses for p in info.prerequisites):
             return -1000
         mh = get_min_hours_required(code, info)
         if mh and total_completed_hours < mh:
             return -1000
 
-        total_hours_sum += offered[code]["hours"]
+        total_hours_sum += offered[code].hours
 
     if total_hours_sum > max_hours:
         return -1000
 
     new_cat = {cat: 0 for cat in category_limits}
     for code in individual:
-        cat = plan.get(code, {}).get("category")
-        if cat in new_cat:
-            new_cat[cat] += offered[code]["hours"]
+        info = plan.get(code)
+        if info is not None and info.category in new_cat:
+            new_cat[info.category] += offered[code].hours
 
     for cat, limit in category_limits.items():
         if TAKEN_CAT_HOURS.get(cat, 0) + new_cat.get(cat, 0) > limit:
@@ -358,9 +403,9 @@ def create_initial_population(population_size, TAKEN_CAT_HOURS):
         total = 0
         individual = []
         for code in course_list:
-            h = offered[code]["hours"]
+            h = offered[code].hours
             if code not in individual and total + h <= max_hours:
-                if offered[code].get("sections"):
+                if offered[code].sections:
                     individual.append(code)
                     total += h
             if total >= max_hours:
@@ -402,7 +447,7 @@ def genetic_algorithm(population_size=100, generations=150):
 
 # -------------------- SIMPLE (no offered) --------------------
 def simple_recommendation(taken_codes: List[str]) -> List[str]:
-    total_completed_hours = sum(taken_courses.get(c, {}).get("hours", plan.get(c, {}).get("hours", 0))
+    total_completed_hours = sum(taken_courses.get(c, {}).get("hours", plan[c].hours if c in plan else 0)
                                 for c in taken_codes)
 
     taken_cat = compute_taken_cat_hours()
@@ -411,13 +456,12 @@ def simple_recommendation(taken_codes: List[str]) -> List[str]:
     priority = {"major_required": 0, "college_required": 1, "university_required": 2,
                 "major_optional": 3, "elective_requirements": 4, "Remedial materials": 5, "": 9}
 
-    for code, info in sorted(plan.items(), key=lambda kv: priority.get(kv[1].get("category",""), 9)):
+    for code, info in sorted(plan.items(), key=lambda kv: priority.get(kv[1].category, 9)):
         if code in taken_codes:
             continue
 
         # تحقق المتطلبات
-        prereqs = info.get("prerequisites", [])
-        if any(p not in taken_codes for p in prereqs):
+        if any(p not in taken_codes for p in info.prerequisites):
             continue
 
         # تحقق min_hours
@@ -425,12 +469,12 @@ def simple_recommendation(taken_codes: List[str]) -> List[str]:
         if mh and total_completed_hours < mh:
             continue
 
-        h = int(info.get("hours", 3) or 0)
+        h = int(info.hours or 0)
         if h <= 0 or sumh + h > max_hours:
             continue
 
         # تحقق حدود التصنيف
-        cat = info.get("category", "")
+        cat = info.category
         if cat in category_limits:
             if taken_cat.get(cat, 0) + h > category_limits[cat]:
                 continue